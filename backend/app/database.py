@@ -1,7 +1,14 @@
 import os
 
+import orjson
 from sqlalchemy import create_engine, Engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase
 
 
 def get_database_url() -> str:
@@ -11,16 +18,66 @@ def get_database_url() -> str:
     return url
 
 
+def get_async_database_url() -> str:
+    """The configured URL with the driver swapped to asyncpg."""
+    url = get_database_url()
+    if url.startswith("postgresql+asyncpg://"):
+        return url
+    scheme, _, rest = url.partition("://")
+    base = scheme.split("+", 1)[0]
+    return f"{base}+asyncpg://{rest}"
+
+
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+
+
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode()
 
 
 def get_engine() -> Engine:
+    """Sync engine, used only for Alembic migrations at startup."""
     global _engine
     if _engine is None:
-        _engine = create_engine(get_database_url(), pool_size=5, max_overflow=10)
+        _engine = create_engine(
+            get_database_url(),
+            pool_pre_ping=True,
+            connect_args={"options": "-c statement_timeout=60000"},
+        )
     return _engine
 
 
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        # Per the Universal Scalability Law, throughput degrades once
+        # concurrency outstrips what Postgres can actually serve; keep the
+        # pool explicit and tunable instead of guessing a bigger is better.
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            pool_size=int(os.environ.get("DATABASE_POOL_SIZE", "20")),
+            max_overflow=int(os.environ.get("DATABASE_MAX_OVERFLOW", "10")),
+            # Validate checkouts so idle connections killed by Postgres or a
+            # NAT don't surface as errors on the first query after a quiet spell.
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_timeout=30,
+            # JSONB recipe documents are the bulk of what moves through this
+            # engine; encode/decode them with orjson at the driver boundary.
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+            connect_args={
+                "server_settings": {"statement_timeout": "60000"},
+                # Repeated statements (the recipe/settings upserts and the
+                # hot lookups) stay prepared on each connection, skipping
+                # re-parse/re-plan on every execution.
+                "prepared_statement_cache_size": 500,
+            },
+        )
+    return _async_engine
+
+
 def dispose_engine() -> None:
     global _engine
     if _engine is not None:
@@ -28,19 +85,45 @@ def dispose_engine() -> None:
         _engine = None
 
 
-class _SessionFactory:
-    """Lazy sessionmaker that defers engine binding until first use."""
+def pool_status() -> dict | None:
+    """Checkout metrics for the async pool, or None before first use.
+
+    Surfaced on /health so saturation (checked_out pinned at pool_size,
+    overflow > 0) is visible without attaching a profiler.
+    """
+    if _async_engine is None:
+        return None
+    pool = _async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+class _AsyncSessionFactory:
+    """Lazy async_sessionmaker that defers engine binding until first use."""
 
     def __init__(self) -> None:
-        self._factory: sessionmaker[Session] | None = None
+        self._factory: async_sessionmaker[AsyncSession] | None = None
 
-    def __call__(self) -> Session:
+    def __call__(self) -> AsyncSession:
         if self._factory is None:
-            self._factory = sessionmaker(bind=get_engine())
+            self._factory = async_sessionmaker(
+                bind=get_async_engine(), expire_on_commit=False
+            )
         return self._factory()
 
 
-SessionLocal = _SessionFactory()
+SessionLocal = _AsyncSessionFactory()
 
 
 class Base(DeclarativeBase):
@@ -1,44 +1,180 @@
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import func
 
-from .database import SessionLocal
+from .database import SessionLocal, get_async_engine
 from .sa_models import Recipe, UserSettings
 
 _ANON = "__anonymous__"
 
 
+@lru_cache(maxsize=1024)
 def _normalize_tiktok_url(raw_url: str) -> str:
     """Strip query params / fragments so the same video always matches."""
     parsed = urlparse(raw_url)
     return urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
 
 
-def lookup_recipe(raw_url: str, user_id: str | None = None) -> dict | None:
+# Recipes are immutable apart from re-processing the same URL, so a small
+# in-process LRU of lookup results saves a round-trip on repeat /process
+# calls. save_recipe refreshes the entry so the cache never goes stale.
+# Read statements built once at import; per-call values arrive as execute()
+# params, so neither the Python construction nor the SQL compile is repeated.
+_LOOKUP_RECIPE_STMT = select(
+    Recipe.id, Recipe.transcript, Recipe.caption, Recipe.recipe
+).where(Recipe.url == bindparam("url"), Recipe.user_id == bindparam("user_id"))
+
+_GET_RECIPE_BY_ID_STMT = select(
+    Recipe.id, Recipe.url, Recipe.recipe, Recipe.created_at
+).where(Recipe.id == bindparam("recipe_id"), Recipe.user_id == bindparam("user_id"))
+
+_GET_SETTINGS_STMT = select(UserSettings).where(
+    UserSettings.user_id == bindparam("user_id")
+)
+
+_LIST_RECIPES_STMT = (
+    select(
+        Recipe.id,
+        Recipe.url,
+        Recipe.recipe["title"].astext.label("title"),
+        Recipe.recipe["description"].astext.label("description"),
+        Recipe.created_at,
+    )
+    .where(Recipe.user_id == bindparam("user_id"))
+    .order_by(Recipe.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+
+def _build_save_recipe_stmt():
+    stmt = pg_insert(Recipe).values(
+        url=bindparam("url"),
+        user_id=bindparam("user_id"),
+        transcript=bindparam("transcript"),
+        caption=bindparam("caption"),
+        recipe=bindparam("recipe"),
+    )
+    return stmt.on_conflict_do_update(
+        constraint="uq_recipes_url_user_id",
+        set_={
+            "transcript": stmt.excluded.transcript,
+            "caption": stmt.excluded.caption,
+            "recipe": stmt.excluded.recipe,
+        },
+    ).returning(Recipe.id)
+
+
+def _build_set_settings_stmt():
+    # The conflict branch merges against the stored row: COALESCE picks the
+    # caller's value when given, otherwise keeps what's there. The insert
+    # branch needs the defaulted spice value, hence the second bindparam.
+    stmt = pg_insert(UserSettings).values(
+        user_id=bindparam("user_id"),
+        dietary_restrictions=bindparam("dietary_restrictions"),
+        spice_tolerance=bindparam("spice_tolerance_insert"),
+        custom_rules=bindparam("custom_rules"),
+        updated_at=func.now(),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "dietary_restrictions": func.coalesce(
+                stmt.excluded.dietary_restrictions, UserSettings.dietary_restrictions
+            ),
+            "spice_tolerance": func.coalesce(
+                bindparam("spice_tolerance"), UserSettings.spice_tolerance
+            ),
+            "custom_rules": func.coalesce(
+                stmt.excluded.custom_rules, UserSettings.custom_rules
+            ),
+            "updated_at": func.now(),
+        },
+    ).returning(
+        UserSettings.user_id,
+        UserSettings.dietary_restrictions,
+        UserSettings.spice_tolerance,
+        UserSettings.custom_rules,
+        UserSettings.updated_at,
+    )
+
+
+# Write statements are Core inserts built once at import and executed on a
+# bare connection: no ORM unit-of-work or identity map on the write path.
+_SAVE_RECIPE_STMT = _build_save_recipe_stmt()
+_SET_SETTINGS_STMT = _build_set_settings_stmt()
+
+_RECIPE_CACHE_MAX = 256
+_recipe_cache: OrderedDict[tuple[str, str], dict] = OrderedDict()
+
+
+def _recipe_cache_get(key: tuple[str, str]) -> dict | None:
+    cached = _recipe_cache.get(key)
+    if cached is not None:
+        _recipe_cache.move_to_end(key)
+    return cached
+
+
+def _recipe_cache_put(key: tuple[str, str], value: dict) -> None:
+    _recipe_cache[key] = value
+    _recipe_cache.move_to_end(key)
+    while len(_recipe_cache) > _RECIPE_CACHE_MAX:
+        _recipe_cache.popitem(last=False)
+
+
+# Same deal for user settings: only set_user_settings mutates them, and it
+# refreshes the entry from its RETURNING row, so the cache stays exact.
+_SETTINGS_CACHE_MAX = 1024
+_settings_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+def _settings_cache_get(user_id: str) -> dict | None:
+    cached = _settings_cache.get(user_id)
+    if cached is not None:
+        _settings_cache.move_to_end(user_id)
+    return cached
+
+
+def _settings_cache_put(user_id: str, value: dict) -> None:
+    _settings_cache[user_id] = value
+    _settings_cache.move_to_end(user_id)
+    while len(_settings_cache) > _SETTINGS_CACHE_MAX:
+        _settings_cache.popitem(last=False)
+
+
+async def lookup_recipe(raw_url: str, user_id: str | None = None) -> dict | None:
     url = _normalize_tiktok_url(raw_url)
     effective_user = user_id or _ANON
 
-    with SessionLocal() as session:
-        row = session.execute(
-            select(Recipe.id, Recipe.transcript, Recipe.caption, Recipe.recipe).where(
-                Recipe.url == url, Recipe.user_id == effective_user
+    cached = _recipe_cache_get((url, effective_user))
+    if cached is not None:
+        return cached
+
+    async with SessionLocal() as session:
+        row = (
+            await session.execute(
+                _LOOKUP_RECIPE_STMT, {"url": url, "user_id": effective_user}
             )
         ).first()
 
     if row is None:
         return None
 
-    return {
+    out = {
         "id": row.id,
         "transcript": row.transcript,
         "caption": row.caption,
         "recipe": row.recipe,
     }
+    _recipe_cache_put((url, effective_user), out)
+    return out
 
 
-def save_recipe(
+async def save_recipe(
     raw_url: str,
     transcript: str,
     caption: str | None,
@@ -48,33 +184,32 @@ def save_recipe(
     url = _normalize_tiktok_url(raw_url)
     effective_user = user_id or _ANON
 
-    stmt = pg_insert(Recipe).values(
-        url=url,
-        user_id=effective_user,
-        transcript=transcript,
-        caption=caption,
-        recipe=recipe,
-    )
-    stmt = stmt.on_conflict_do_update(
-        constraint="uq_recipes_url_user_id",
-        set_={
-            "transcript": stmt.excluded.transcript,
-            "caption": stmt.excluded.caption,
-            "recipe": stmt.excluded.recipe,
-        },
-    ).returning(Recipe.id)
+    async with get_async_engine().begin() as conn:
+        (rid,) = (
+            await conn.execute(
+                _SAVE_RECIPE_STMT,
+                {
+                    "url": url,
+                    "user_id": effective_user,
+                    "transcript": transcript,
+                    "caption": caption,
+                    "recipe": recipe,
+                },
+            )
+        ).first()
 
-    with SessionLocal() as session:
-        (rid,) = session.execute(stmt).first()
-        session.commit()
-        return rid
+    _recipe_cache_put(
+        (url, effective_user),
+        {"id": rid, "transcript": transcript, "caption": caption, "recipe": recipe},
+    )
+    return rid
 
 
-def get_recipe_by_id(recipe_id: int, user_id: str) -> dict | None:
-    with SessionLocal() as session:
-        row = session.execute(
-            select(Recipe.id, Recipe.url, Recipe.recipe, Recipe.created_at).where(
-                Recipe.id == recipe_id, Recipe.user_id == user_id
+async def get_recipe_by_id(recipe_id: int, user_id: str) -> dict | None:
+    async with SessionLocal() as session:
+        row = (
+            await session.execute(
+                _GET_RECIPE_BY_ID_STMT, {"recipe_id": recipe_id, "user_id": user_id}
             )
         ).first()
     if row is None:
@@ -87,69 +222,78 @@ def get_recipe_by_id(recipe_id: int, user_id: str) -> dict | None:
     }
 
 
-def get_user_settings(user_id: str) -> dict | None:
-    with SessionLocal() as session:
-        row = session.scalars(
-            select(UserSettings).where(UserSettings.user_id == user_id)
+async def get_user_settings(user_id: str) -> dict | None:
+    cached = _settings_cache_get(user_id)
+    if cached is not None:
+        return cached
+
+    async with SessionLocal() as session:
+        row = (
+            await session.scalars(_GET_SETTINGS_STMT, {"user_id": user_id})
         ).first()
     if row is None:
         return None
-    return {
+    out = {
         "user_id": row.user_id,
         "dietary_restrictions": row.dietary_restrictions,
         "spice_tolerance": row.spice_tolerance,
         "custom_rules": row.custom_rules,
         "updated_at": row.updated_at.isoformat() if row.updated_at else None,
     }
+    _settings_cache_put(user_id, out)
+    return out
 
 
-def set_user_settings(
+async def set_user_settings(
     user_id: str,
     dietary_restrictions: str | None = None,
     spice_tolerance: int | None = None,
     custom_rules: str | None = None,
 ) -> dict:
-    existing = get_user_settings(user_id)
-    merged = {
-        "dietary_restrictions": dietary_restrictions if dietary_restrictions is not None else (existing or {}).get("dietary_restrictions"),
-        "spice_tolerance": spice_tolerance if spice_tolerance is not None else (existing or {}).get("spice_tolerance", 2),
-        "custom_rules": custom_rules if custom_rules is not None else (existing or {}).get("custom_rules"),
+    # Merge inside the UPSERT (None means "keep the stored value") so the
+    # whole read-merge-write happens in one round-trip instead of three.
+    async with get_async_engine().begin() as conn:
+        row = (
+            await conn.execute(
+                _SET_SETTINGS_STMT,
+                {
+                    "user_id": user_id,
+                    "dietary_restrictions": dietary_restrictions,
+                    "spice_tolerance": spice_tolerance,
+                    "spice_tolerance_insert": spice_tolerance if spice_tolerance is not None else 2,
+                    "custom_rules": custom_rules,
+                },
+            )
+        ).first()
+    out = {
+        "user_id": row.user_id,
+        "dietary_restrictions": row.dietary_restrictions,
+        "spice_tolerance": row.spice_tolerance,
+        "custom_rules": row.custom_rules,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
     }
-    stmt = pg_insert(UserSettings).values(
-        user_id=user_id,
-        dietary_restrictions=merged["dietary_restrictions"],
-        spice_tolerance=merged["spice_tolerance"],
-        custom_rules=merged["custom_rules"],
-        updated_at=func.now(),
-    )
-    stmt = stmt.on_conflict_do_update(
-        index_elements=["user_id"],
-        set_={
-            "dietary_restrictions": stmt.excluded.dietary_restrictions,
-            "spice_tolerance": stmt.excluded.spice_tolerance,
-            "custom_rules": stmt.excluded.custom_rules,
-            "updated_at": func.now(),
-        },
-    )
-    with SessionLocal() as session:
-        session.execute(stmt)
-        session.commit()
-    return get_user_settings(user_id) or {}
-
-
-def list_recipes_for_user(user_id: str) -> list[dict]:
-    with SessionLocal() as session:
-        rows = session.execute(
-            select(Recipe.id, Recipe.url, Recipe.recipe, Recipe.created_at)
-            .where(Recipe.user_id == user_id)
-            .order_by(Recipe.created_at.desc())
+    _settings_cache_put(user_id, out)
+    return out
+
+
+async def list_recipes_for_user(
+    user_id: str, limit: int = 50, offset: int = 0
+) -> list[dict]:
+    # The listing UI only shows title + description, so extract those in SQL
+    # instead of shipping every full recipe JSONB document over the wire.
+    async with SessionLocal() as session:
+        rows = (
+            await session.execute(
+                _LIST_RECIPES_STMT,
+                {"user_id": user_id, "limit": limit, "offset": offset},
+            )
         ).all()
 
     return [
         {
             "id": r.id,
             "url": r.url,
-            "recipe": r.recipe,
+            "recipe": {"title": r.title, "description": r.description},
             "created_at": r.created_at.isoformat(),
         }
         for r in rows
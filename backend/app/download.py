@@ -1,45 +1,78 @@
-import json
-import subprocess
+import asyncio
 import tempfile
 import os
 from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
-class DownloadResult:
-    video_path: str
+
+@dataclass(slots=True)
+class AudioDownloadResult:
+    audio: np.ndarray
     caption: str | None
 
 
-def download_tiktok(url: str, output_path: str | None = None) -> DownloadResult:
-    if output_path is None:
-        output_path = os.path.join(tempfile.mkdtemp(), "video.mp4")
+async def download_tiktok_audio(url: str) -> AudioDownloadResult:
+    """Download and decode in one pipeline: yt-dlp streams the video to
+    ffmpeg, which resamples to the 16 kHz mono float32 PCM Whisper expects.
+
+    Nothing touches disk except the caption sidecar, so transcription can
+    start as soon as the pipeline drains instead of after a write + re-read
+    of a temp mp4. Both processes run as asyncio subprocesses joined by a
+    kernel pipe, so no worker thread sits blocked on the transfer.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        caption_path = os.path.join(tmpdir, "caption.txt")
+        ytdlp_err_path = os.path.join(tmpdir, "yt-dlp.err")
 
-    meta_result = subprocess.run(
-        ["yt-dlp", "--no-playlist", "--dump-json", url],
-        capture_output=True,
-        text=True,
-    )
-    caption = None
-    if meta_result.returncode == 0:
+        pipe_read, pipe_write = os.pipe()
         try:
-            info = json.loads(meta_result.stdout)
-            caption = info.get("description")
-        except json.JSONDecodeError:
-            pass
-
-    dl_result = subprocess.run(
-        [
-            "yt-dlp",
-            "--no-playlist",
-            "-f", "mp4",
-            "-o", output_path,
-            url,
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if dl_result.returncode != 0:
-        raise RuntimeError(f"yt-dlp failed: {dl_result.stderr}")
-
-    return DownloadResult(video_path=output_path, caption=caption)
+            with open(ytdlp_err_path, "wb") as ytdlp_err:
+                ytdlp = await asyncio.create_subprocess_exec(
+                    "yt-dlp",
+                    "--no-playlist",
+                    "-f", "mp4",
+                    "-o", "-",
+                    "--print-to-file", "%(description)s", caption_path,
+                    url,
+                    stdout=pipe_write,
+                    stderr=ytdlp_err,
+                )
+                ffmpeg = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-nostdin",
+                    "-i", "pipe:0",
+                    "-f", "s16le",
+                    "-ac", "1",
+                    "-ar", "16000",
+                    "pipe:1",
+                    stdin=pipe_read,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+        finally:
+            # Parent copies are inherited by the children; close ours so
+            # ffmpeg sees EOF when yt-dlp finishes (and EPIPE propagates).
+            os.close(pipe_read)
+            os.close(pipe_write)
+
+        raw = await ffmpeg.stdout.read()
+        await ffmpeg.wait()
+        await ytdlp.wait()
+
+        if ytdlp.returncode != 0:
+            with open(ytdlp_err_path, "r", errors="replace") as f:
+                raise RuntimeError(f"yt-dlp failed: {f.read()}")
+        if ffmpeg.returncode != 0 or not raw:
+            raise RuntimeError("ffmpeg failed to decode audio from the video stream")
+
+        caption = None
+        if os.path.exists(caption_path):
+            with open(caption_path, "r", errors="replace") as f:
+                text = f.read().strip()
+            # yt-dlp prints the literal "NA" for missing fields
+            if text and text != "NA":
+                caption = text
+
+    audio = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+    return AudioDownloadResult(audio=audio, caption=caption)
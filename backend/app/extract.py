@@ -1,6 +1,6 @@
-import json
+import orjson
 
-import anthropic
+from .llm import get_client
 
 RECIPE_EXTRACTION_PROMPT = """\
 You are a recipe extraction assistant. Your task is to extract recipe information from a transcript and return it as a structured JSON object.
@@ -85,11 +85,20 @@ def extract_recipe(
     user_settings: dict | None = None,
     model: str = "claude-sonnet-4-20250514",
 ) -> dict:
-    client = anthropic.Anthropic(api_key=api_key)
-
-    system = RECIPE_EXTRACTION_PROMPT
+    client = get_client(api_key)
+
+    # The extraction instructions are identical for every video, so mark
+    # them as a cache breakpoint; only the (small) per-user settings block
+    # is sent uncached.
+    system = [
+        {
+            "type": "text",
+            "text": RECIPE_EXTRACTION_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
     if user_settings:
-        system += _settings_prompt_block(user_settings)
+        system.append({"type": "text", "text": _settings_prompt_block(user_settings)})
 
     user_parts = []
     if caption:
@@ -97,17 +106,18 @@ def extract_recipe(
     user_parts.append(f"Transcript:\n\n{transcript}")
     user_content = "\n\n---\n\n".join(user_parts)
 
-    response = client.messages.create(
+    # Streaming keeps the connection moving for the 30-60s generations that
+    # messages.create would otherwise hold silently (and can time out on).
+    with client.messages.stream(
         model=model,
         max_tokens=4096,
         system=system,
         messages=[
             {"role": "user", "content": user_content},
         ],
-    )
-
-    text = response.content[0].text
-    out = json.loads(text)
+    ) as stream:
+        text = stream.get_final_text()
+    out = orjson.loads(text)
     if "modifications" not in out:
         out["modifications"] = []
     return out
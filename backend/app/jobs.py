@@ -0,0 +1,44 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+_FINISHED = {"done", "error"}
+_MAX_JOBS = 500
+
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    status: str = "pending"  # pending | running | done | error
+    result: Any | None = None
+    error: str | None = None
+    error_status: int = 500
+    # Keep a reference so the running asyncio task isn't garbage-collected.
+    task: asyncio.Task | None = None
+
+
+_jobs: OrderedDict[str, Job] = OrderedDict()
+
+
+def create_job() -> Job:
+    _prune()
+    job = Job(id=uuid.uuid4().hex)
+    _jobs[job.id] = job
+    return job
+
+
+def get_job(job_id: str) -> Job | None:
+    return _jobs.get(job_id)
+
+
+def _prune() -> None:
+    """Evict the oldest finished jobs once the store grows past the cap."""
+    if len(_jobs) < _MAX_JOBS:
+        return
+    for job_id, job in list(_jobs.items()):
+        if job.status in _FINISHED:
+            del _jobs[job_id]
+        if len(_jobs) < _MAX_JOBS:
+            return
@@ -0,0 +1,27 @@
+import os
+
+import anthropic
+
+_client: anthropic.Anthropic | None = None
+_async_client: anthropic.AsyncAnthropic | None = None
+
+
+def get_client(api_key: str | None = None) -> anthropic.Anthropic:
+    """Process-wide Anthropic client so every call reuses the same HTTP
+    connection pool instead of paying a TCP + TLS handshake per request."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY")
+        )
+    return _client
+
+
+def get_async_client(api_key: str | None = None) -> anthropic.AsyncAnthropic:
+    """Async twin of get_client, for endpoints that stream on the event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = anthropic.AsyncAnthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY")
+        )
+    return _async_client
@@ -1,49 +1,39 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
-from alembic import command
-from alembic.config import Config
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from .models import ProcessRequest, ProcessResponse, Recipe, ChatRequest, SettingsResponse, SettingsUpdate
-from .download import download_tiktok
-from .transcribe import transcribe_video
+from .models import ProcessRequest, ProcessResponse, ProcessJobStatus, Recipe, ChatRequest, SettingsResponse, SettingsUpdate
+from .jobs import Job, create_job, get_job
+from .download import download_tiktok_audio
+from .transcribe import preload_model, transcribe_audio_async
 from .extract import extract_recipe
 from .db import lookup_recipe, save_recipe, list_recipes_for_user, get_recipe_by_id, get_user_settings, set_user_settings
-from .database import dispose_engine
-
-
-def _run_migrations() -> None:
-    from sqlalchemy import inspect, text
-    from .database import get_engine
-
-    alembic_cfg = Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
-    alembic_cfg.set_main_option(
-        "script_location",
-        os.path.join(os.path.dirname(__file__), "..", "migrations"),
-    )
-
-    eng = get_engine()
-    inspector = inspect(eng)
-    has_alembic = "alembic_version" in inspector.get_table_names()
-    has_recipes = "recipes" in inspector.get_table_names()
-
-    if has_recipes and not has_alembic:
-        # DB predates Alembic; stamp it at 001 so only newer migrations run
-        command.stamp(alembic_cfg, "001")
-
-    command.upgrade(alembic_cfg, "head")
+from .database import dispose_engine, dispose_async_engine, pool_status
+from .llm import get_async_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _run_migrations()
+    # Migrations run out-of-band via `python -m app.migrate` before startup.
+    # Load Whisper now so the first /process doesn't eat the multi-second
+    # model load on top of its own work.
+    await preload_model()
     yield
+    await dispose_async_engine()
     dispose_engine()
 
 
-app = FastAPI(title="Touille", description="TikTok recipe extractor", lifespan=lifespan)
+app = FastAPI(
+    title="Touille",
+    description="TikTok recipe extractor",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -63,113 +53,151 @@ def _get_api_key() -> str:
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "dev_reload": "works"}
+    return {"status": "ok", "dev_reload": "works", "db_pool": pool_status()}
+
+
+async def _run_process_job(job: Job, url_str: str, user_id: str | None, api_key: str) -> None:
+    job.status = "running"
+
+    # The settings lookup is independent of the media pipeline, so let it
+    # overlap the download + transcription instead of running after them.
+    settings_task = asyncio.create_task(get_user_settings(user_id)) if user_id else None
+
+    try:
+        try:
+            result = await download_tiktok_audio(url_str)
+        except RuntimeError as e:
+            job.error, job.error_status, job.status = f"Failed to download video: {e}", 422, "error"
+            return
+
+        try:
+            transcript = await transcribe_audio_async(result.audio)
+        except Exception as e:
+            job.error, job.error_status, job.status = f"Transcription failed: {e}", 500, "error"
+            return
+
+        user_settings = await settings_task if settings_task is not None else None
+
+        try:
+            recipe_dict = await asyncio.to_thread(
+                extract_recipe, transcript, api_key, caption=result.caption, user_settings=user_settings
+            )
+            recipe = Recipe(**recipe_dict)
+        except Exception as e:
+            job.error, job.error_status, job.status = f"Recipe extraction failed: {e}", 500, "error"
+            return
+
+        recipe_id = await save_recipe(url_str, transcript, result.caption, recipe_dict, user_id=user_id)
+
+        job.result = ProcessResponse(
+            transcript=transcript,
+            caption=result.caption,
+            recipe=recipe,
+            recipe_id=recipe_id,
+        )
+        job.status = "done"
+    except Exception as e:
+        # Nothing may escape the runner: an unhandled exception would strand
+        # the job in "running" and clients would poll it into a timeout.
+        # This catches what the step-specific handlers don't (save_recipe
+        # failures, the settings lookup, non-RuntimeError download errors).
+        job.error, job.error_status, job.status = f"Processing failed: {e}", 500, "error"
+    finally:
+        if settings_task is not None and not settings_task.done():
+            settings_task.cancel()
+
+
+def _job_response(job: Job, status_code: int = 200) -> ORJSONResponse:
+    # Returning a Response keeps FastAPI from re-validating the payload:
+    # results were validated once where they were produced (at extraction,
+    # or for cache hits back when the recipe was first saved).
+    result = job.result
+    if isinstance(result, ProcessResponse):
+        result = result.model_dump()
+    return ORJSONResponse(
+        {
+            "job_id": job.id,
+            "status": job.status,
+            "result": result,
+            "error": job.error,
+            "error_status": job.error_status if job.status == "error" else None,
+        },
+        status_code=status_code,
+    )
 
 
-@app.post("/process", response_model=ProcessResponse)
+@app.post("/process", response_model=ProcessJobStatus, status_code=202)
 async def process_video(req: ProcessRequest):
     url_str = str(req.url)
     user_id = req.user_id
 
-    cached = lookup_recipe(url_str, user_id=user_id)
+    cached = await lookup_recipe(url_str, user_id=user_id)
     if cached is not None:
-        return ProcessResponse(
-            transcript=cached["transcript"],
-            caption=cached["caption"],
-            recipe=Recipe(**cached["recipe"]),
-            recipe_id=cached["id"],
-        )
+        job = create_job()
+        job.result = {
+            "transcript": cached["transcript"],
+            "caption": cached["caption"],
+            "recipe": cached["recipe"],
+            "recipe_id": cached["id"],
+        }
+        job.status = "done"
+        return _job_response(job, status_code=202)
 
     api_key = _get_api_key()
 
-    try:
-        result = download_tiktok(url_str)
-    except RuntimeError as e:
-        raise HTTPException(status_code=422, detail=f"Failed to download video: {e}")
-
-    try:
-        transcript = transcribe_video(result.video_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {e}")
-    finally:
-        if result.video_path and os.path.exists(result.video_path):
-            os.unlink(result.video_path)
-
-    user_settings = get_user_settings(user_id) if user_id else None
-    try:
-        recipe_dict = extract_recipe(
-            transcript, api_key, caption=result.caption, user_settings=user_settings
-        )
-        recipe = Recipe(**recipe_dict)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Recipe extraction failed: {e}")
+    job = create_job()
+    job.task = asyncio.create_task(_run_process_job(job, url_str, user_id, api_key))
+    return _job_response(job, status_code=202)
 
-    recipe_id = save_recipe(url_str, transcript, result.caption, recipe_dict, user_id=user_id)
 
-    return ProcessResponse(
-        transcript=transcript,
-        caption=result.caption,
-        recipe=recipe,
-        recipe_id=recipe_id,
-    )
+@app.get("/process/jobs/{job_id}", response_model=ProcessJobStatus)
+async def get_process_job(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
 
 
 @app.get("/settings", response_model=SettingsResponse | None)
 async def get_settings(user_id: str):
-    return get_user_settings(user_id)
+    return await get_user_settings(user_id)
 
 
 @app.put("/settings", response_model=SettingsResponse)
 async def put_settings(user_id: str, body: SettingsUpdate):
-    set_user_settings(
+    out = await set_user_settings(
         user_id,
         dietary_restrictions=body.dietary_restrictions,
         spice_tolerance=body.spice_tolerance,
         custom_rules=body.custom_rules,
     )
-    out = get_user_settings(user_id)
     if not out:
         raise HTTPException(status_code=500, detail="Settings not saved")
     return SettingsResponse(**out)
 
 
 @app.get("/recipes")
-async def get_user_recipes(user_id: str):
-    return list_recipes_for_user(user_id)
+async def get_user_recipes(
+    user_id: str,
+    limit: int = Query(50, ge=0, le=200),
+    offset: int = Query(0, ge=0),
+):
+    return await list_recipes_for_user(user_id, limit=limit, offset=offset)
 
 
 @app.get("/recipes/{recipe_id}")
 async def get_recipe(recipe_id: int, user_id: str):
-    recipe = get_recipe_by_id(recipe_id, user_id)
+    recipe = await get_recipe_by_id(recipe_id, user_id)
     if recipe is None:
         raise HTTPException(status_code=404, detail="Recipe not found")
     return recipe
 
 
-def _build_chat_prompt(req: ChatRequest) -> tuple[str, list[dict]]:
-    ingredients_text = "\n".join(
-        f"- {ing.amount or ''} {ing.unit or ''} {ing.name} {('(' + ing.notes + ')') if ing.notes else ''}".strip()
-        for ing in req.recipe.ingredients
-    )
-    steps_text = "\n".join(
-        f"  Step {s.order}{' [COMPLETED]' if s.order in req.completed_steps else ''}{' [CURRENT]' if s.order == req.current_step else ''}: {s.instruction}"
-        for s in req.recipe.steps
-    )
-
-    system_prompt = f"""You are a friendly, expert cooking assistant helping someone cook a recipe in real time.
-
-Recipe: {req.recipe.title}
-{f'Description: {req.recipe.description}' if req.recipe.description else ''}
+# The chat system prompt is mostly static; only the recipe/progress block
+# changes per request, so evaluate the fixed text once at import.
+_CHAT_SYSTEM_PREFIX = "You are a friendly, expert cooking assistant helping someone cook a recipe in real time."
 
-Ingredients:
-{ingredients_text}
-
-Steps:
-{steps_text}
-
-The user is currently on Step {req.current_step}. Steps marked [COMPLETED] are already done.
-
-Give concise, practical advice. If they describe a problem, help them fix it with what they likely have on hand. Keep answers short (2-4 sentences) unless more detail is needed.
+_CHAT_SYSTEM_SUFFIX = """Give concise, practical advice. If they describe a problem, help them fix it with what they likely have on hand. Keep answers short (2-4 sentences) unless more detail is needed.
 
 When needed, ask a brief clarifying question so you can give the best possible answer. For example: if the question is ambiguous, if you need to know what equipment or ingredients they have on hand, if scale or dietary constraints matter, or if their goal (e.g. faster vs. more authentic) would change your advice, ask one short question before answering. Do not ask for the sake of it; only when the answer would clearly be better with that information.
 
@@ -179,31 +207,98 @@ Format your response using markdown to make it easy to scan:
 - Use *italics* for emphasis on warnings or important notes
 - Do NOT use headings or code blocks"""
 
-    messages = [
-        {"role": m.role, "content": m.content}
-        for m in req.history
+# The system prompt carries two cache breakpoints: the fixed instructions
+# and the per-recipe block, which is stable for a whole cooking session and
+# is what pushes the cached prefix past the API's ~1024-token minimum. Only
+# the short progress tail (current/completed steps) changes per turn, so it
+# goes last, uncached.
+_CHAT_STATIC_BLOCK = {
+    "type": "text",
+    "text": f"{_CHAT_SYSTEM_PREFIX}\n\n{_CHAT_SYSTEM_SUFFIX}",
+    "cache_control": {"type": "ephemeral"},
+}
+
+
+def _ingredient_line(ing) -> str:
+    # Append only the fields that exist, then join: no per-line strip() and
+    # no doubled spaces from empty placeholders.
+    parts = ["-"]
+    if ing.amount:
+        parts.append(str(ing.amount))
+    if ing.unit:
+        parts.append(ing.unit)
+    parts.append(ing.name)
+    if ing.notes:
+        parts.append(f"({ing.notes})")
+    return " ".join(parts)
+
+
+def _build_chat_prompt(req: ChatRequest) -> tuple[list[dict], tuple[dict, ...]]:
+    ingredients_text = "\n".join(_ingredient_line(ing) for ing in req.recipe.ingredients)
+
+    # No per-turn markers in the step list: keeping this block byte-stable
+    # across a session is what lets its cache breakpoint hit.
+    steps_text = "\n".join(
+        f"  Step {s.order}: {s.instruction}" for s in req.recipe.steps
+    )
+
+    parts = [f"Recipe: {req.recipe.title}"]
+    if req.recipe.description:
+        parts.append(f"Description: {req.recipe.description}")
+    parts.append(f"Ingredients:\n{ingredients_text}")
+    parts.append(f"Steps:\n{steps_text}")
+
+    progress = f"The user is currently on Step {req.current_step}."
+    completed = sorted(set(req.completed_steps))
+    if completed:
+        progress += f" Steps already completed: {', '.join(str(n) for n in completed)}."
+    else:
+        progress += " No steps are completed yet."
+
+    system = [
+        _CHAT_STATIC_BLOCK,
+        {
+            "type": "text",
+            "text": "\n\n".join(parts),
+            "cache_control": {"type": "ephemeral"},
+        },
+        {"type": "text", "text": progress},
     ]
-    messages.append({"role": "user", "content": req.message})
-    return system_prompt, messages
+
+    # One pass over the history, no intermediate list growth; the tuple is
+    # handed to the SDK as-is.
+    messages = (
+        *({"role": m.role, "content": m.content} for m in req.history),
+        {"role": "user", "content": req.message},
+    )
+    return system, messages
 
 
 @app.post("/chat")
 async def chat_about_step(req: ChatRequest):
-    import anthropic
-    from fastapi.responses import StreamingResponse
-
     api_key = _get_api_key()
-    client = anthropic.Anthropic(api_key=api_key)
-    system_prompt, messages = _build_chat_prompt(req)
+    client = get_async_client(api_key)
+    system, messages = _build_chat_prompt(req)
 
-    def generate():
-        with client.messages.stream(
+    async def generate():
+        # SSE frames, one per model chunk; JSON-encode the text so newlines
+        # inside a chunk can't be confused with frame boundaries.
+        async with client.messages.stream(
             model="claude-sonnet-4-20250514",
             max_tokens=512,
-            system=system_prompt,
+            system=system,
             messages=messages,
         ) as stream:
-            for text in stream.text_stream:
-                yield text
-
-    return StreamingResponse(generate(), media_type="text/plain")
+            async for text in stream.text_stream:
+                yield b"data: " + orjson.dumps({"text": text}) + b"\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Tell nginx-style proxies not to aggregate the stream; each
+            # chunk should reach the client as soon as it's yielded.
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,45 @@
+"""Run Alembic migrations against DATABASE_URL.
+
+Invoked as `python -m app.migrate` before the server starts (see the
+Dockerfile CMD / dev compose command) so schema changes happen exactly once
+per deploy instead of inside every worker's FastAPI lifespan.
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from .database import dispose_engine, get_engine
+
+
+def run_migrations() -> None:
+    alembic_cfg = Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
+    alembic_cfg.set_main_option(
+        "script_location",
+        os.path.join(os.path.dirname(__file__), "..", "migrations"),
+    )
+
+    with get_engine().connect() as conn:
+        existing = set(
+            conn.execute(
+                text(
+                    "SELECT tablename FROM pg_catalog.pg_tables"
+                    " WHERE schemaname = 'public'"
+                    " AND tablename IN ('alembic_version', 'recipes')"
+                )
+            ).scalars()
+        )
+    has_alembic = "alembic_version" in existing
+    has_recipes = "recipes" in existing
+
+    if has_recipes and not has_alembic:
+        # DB predates Alembic; stamp it at 001 so only newer migrations run
+        command.stamp(alembic_cfg, "001")
+
+    command.upgrade(alembic_cfg, "head")
+
+
+if __name__ == "__main__":
+    run_migrations()
+    dispose_engine()
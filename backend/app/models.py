@@ -56,6 +56,14 @@ class ProcessResponse(BaseModel):
     recipe_id: int | None = None
 
 
+class ProcessJobStatus(BaseModel):
+    job_id: str
+    status: str  # "pending" | "running" | "done" | "error"
+    result: ProcessResponse | None = None
+    error: str | None = None
+    error_status: int | None = None
+
+
 class ChatMessage(BaseModel):
     role: str  # "user" | "assistant"
     content: str
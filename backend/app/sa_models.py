@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import DateTime, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -26,7 +26,27 @@ class Recipe(Base):
     __tablename__ = "recipes"
     __table_args__ = (
         UniqueConstraint("url", "user_id", name="uq_recipes_url_user_id"),
-        Index("ix_recipes_user_id", "user_id"),
+        # Anonymous lookups dominate; a partial index keeps them off the
+        # full (url, user_id) btree.
+        Index(
+            "uq_recipes_url_anon",
+            "url",
+            unique=True,
+            postgresql_where=text("user_id = '__anonymous__'"),
+        ),
+        Index(
+            "ix_recipes_user_id_url",
+            "user_id",
+            "url",
+            postgresql_include=["id"],
+        ),
+        # Serves the listing's ORDER BY created_at DESC ... LIMIT without a
+        # sort over the user's full history.
+        Index(
+            "ix_recipes_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
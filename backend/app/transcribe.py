@@ -1,12 +1,50 @@
-import whisper
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-_model_cache: dict[str, whisper.Whisper] = {}
+import numpy as np
+from faster_whisper import WhisperModel
 
+_model_cache: dict[str, WhisperModel] = {}
 
-def transcribe_video(video_path: str, model_name: str = "base") -> str:
+# Whisper inference is CPU-bound and the model isn't thread-safe; a
+# dedicated single worker keeps it off the default executor (shared with
+# Starlette's threadpool) and serializes access to the model.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+
+def _get_model(model_name: str) -> WhisperModel:
     if model_name not in _model_cache:
-        _model_cache[model_name] = whisper.load_model(model_name)
+        # CTranslate2 backend with int8 weights: ~4x smaller and noticeably
+        # faster on CPU than the reference implementation, with negligible
+        # accuracy loss on short cooking clips.
+        _model_cache[model_name] = WhisperModel(
+            model_name, device="cpu", compute_type="int8"
+        )
+    return _model_cache[model_name]
+
+
+def transcribe_audio(audio: np.ndarray, model_name: str = "base") -> str:
+    """Transcribe already-decoded 16 kHz mono float32 PCM (skips the
+    model's internal ffmpeg file load)."""
+    # Greedy decoding (beam_size=1) is ~2-3x faster than the default beam
+    # of 5 and indistinguishable on clearly-spoken narration; the VAD
+    # filter skips the music-only stretches TikToks are padded with.
+    segments, _ = _get_model(model_name).transcribe(
+        audio, beam_size=1, vad_filter=True
+    )
+    return "".join(segment.text for segment in segments)
+
+
+async def preload_model(model_name: str = "base") -> None:
+    """Load the model on the worker thread ahead of the first request."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_executor, partial(_get_model, model_name))
+
 
-    model = _model_cache[model_name]
-    result = model.transcribe(video_path)
-    return result["text"]
+async def transcribe_audio_async(audio: np.ndarray, model_name: str = "base") -> str:
+    """transcribe_audio on the dedicated Whisper worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, partial(transcribe_audio, audio, model_name=model_name)
+    )
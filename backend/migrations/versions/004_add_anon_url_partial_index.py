@@ -0,0 +1,30 @@
+"""add unique partial index for anonymous recipe lookups
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-08-29
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "uq_recipes_url_anon",
+        "recipes",
+        ["url"],
+        unique=True,
+        postgresql_where=sa.text("user_id = '__anonymous__'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_recipes_url_anon", table_name="recipes")
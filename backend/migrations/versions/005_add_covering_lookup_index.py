@@ -0,0 +1,32 @@
+"""add covering index for per-user recipe lookups
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-08-29
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, url) with id carried in the leaf pages lets the lookup
+    # resolve the row pointer without a heap visit. transcript/recipe are
+    # TOAST-sized and deliberately not INCLUDEd - they'd bloat every leaf
+    # page for no index-only-scan benefit.
+    op.create_index(
+        "ix_recipes_user_id_url",
+        "recipes",
+        ["user_id", "url"],
+        postgresql_include=["id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_user_id_url", table_name="recipes")
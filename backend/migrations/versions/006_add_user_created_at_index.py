@@ -0,0 +1,31 @@
+"""add (user_id, created_at DESC) index for recipe listings
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-08-29
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # list_recipes_for_user orders by created_at DESC with a LIMIT; this
+    # index lets Postgres walk the newest rows directly instead of scanning
+    # ix_recipes_user_id and sorting the user's whole history first.
+    op.create_index(
+        "ix_recipes_user_id_created_at",
+        "recipes",
+        ["user_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_user_id_created_at", table_name="recipes")
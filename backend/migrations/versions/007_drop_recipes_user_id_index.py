@@ -0,0 +1,26 @@
+"""drop the redundant ix_recipes_user_id index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-08-29
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # user_id is a strict prefix of both ix_recipes_user_id_url and
+    # ix_recipes_user_id_created_at, so this index can't serve any query
+    # those don't; keeping it only adds write amplification on saves.
+    op.drop_index("ix_recipes_user_id", table_name="recipes")
+
+
+def downgrade() -> None:
+    op.create_index("ix_recipes_user_id", "recipes", ["user_id"])
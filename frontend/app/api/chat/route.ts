@@ -2,6 +2,31 @@ import { NextRequest } from "next/server";
 
 const BACKEND_URL = process.env.BACKEND_URL ?? "http://localhost:8000";
 
+// The backend streams SSE frames (`data: {"text": ...}\n\n`); unwrap them
+// back into plain text here so the chat UI keeps appending raw chunks.
+function sseToText(): TransformStream<Uint8Array, Uint8Array> {
+  const decoder = new TextDecoder();
+  const encoder = new TextEncoder();
+  let buffer = "";
+
+  return new TransformStream({
+    transform(chunk, controller) {
+      buffer += decoder.decode(chunk, { stream: true });
+      const frames = buffer.split("\n\n");
+      buffer = frames.pop() ?? "";
+      for (const frame of frames) {
+        for (const line of frame.split("\n")) {
+          if (!line.startsWith("data: ")) continue;
+          try {
+            const { text } = JSON.parse(line.slice(6));
+            if (text) controller.enqueue(encoder.encode(text));
+          } catch {}
+        }
+      }
+    },
+  });
+}
+
 export async function POST(req: NextRequest) {
   const body = await req.json();
 
@@ -16,7 +41,11 @@ export async function POST(req: NextRequest) {
     return new Response(text, { status: res.status });
   }
 
-  return new Response(res.body, {
-    headers: { "Content-Type": "text/plain; charset=utf-8" },
+  return new Response(res.body.pipeThrough(sseToText()), {
+    headers: {
+      "Content-Type": "text/plain; charset=utf-8",
+      "Cache-Control": "no-cache",
+      "X-Accel-Buffering": "no",
+    },
   });
 }
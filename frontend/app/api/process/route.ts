@@ -4,6 +4,28 @@ import { headers } from "next/headers";
 
 const BACKEND_URL = process.env.BACKEND_URL ?? "http://localhost:8000";
 
+const POLL_INTERVAL_MS = 2000;
+const MAX_POLLS = 150; // ~5 minutes
+
+type ProcessJobStatus = {
+  job_id: string;
+  status: "pending" | "running" | "done" | "error";
+  result?: unknown;
+  error?: string;
+  error_status?: number;
+};
+
+function finish(job: ProcessJobStatus): NextResponse | null {
+  if (job.status === "done") return NextResponse.json(job.result);
+  if (job.status === "error") {
+    return NextResponse.json(
+      { detail: job.error ?? "Processing failed" },
+      { status: job.error_status ?? 500 }
+    );
+  }
+  return null;
+}
+
 export async function POST(req: NextRequest) {
   const body = await req.json();
 
@@ -22,6 +44,21 @@ export async function POST(req: NextRequest) {
     body: JSON.stringify(backendBody),
   });
 
-  const data = await res.json();
-  return NextResponse.json(data, { status: res.status });
+  const job: ProcessJobStatus = await res.json();
+  if (!res.ok) return NextResponse.json(job, { status: res.status });
+
+  // The backend now runs the pipeline as a background job; poll it here so
+  // the page keeps getting a single request/response.
+  let done = finish(job);
+  for (let i = 0; done === null && i < MAX_POLLS; i++) {
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    const poll = await fetch(`${BACKEND_URL}/process/jobs/${job.job_id}`, {
+      cache: "no-store",
+    });
+    const data: ProcessJobStatus = await poll.json();
+    if (!poll.ok) return NextResponse.json(data, { status: poll.status });
+    done = finish(data);
+  }
+
+  return done ?? NextResponse.json({ detail: "Processing timed out" }, { status: 504 });
 }
@@ -16,7 +16,8 @@ interface ProcessResponse {
 interface SavedRecipe {
   id: number;
   url: string;
-  recipe: Recipe;
+  // The listing endpoint only returns the summary fields
+  recipe: Pick<Recipe, "title" | "description">;
   created_at: string;
 }
 